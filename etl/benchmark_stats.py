@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+AI Workforce Analytics Platform - Benchmark Statistics
+============================================================================
+Description: Bootstrap confidence intervals and significance tests for the
+             benchmark metrics checked by the ETL pipeline
+Author: Group 14
+Version: 1.0
+============================================================================
+
+Every benchmark metric is a proportion (or a difference of two proportions),
+so a bootstrap resample of a group only depends on its size and number of
+positives. Resampling n rows with k positives is the same as drawing
+Binomial(n, k/n), which lets us resample the per-segment counts in one
+batched NumPy call instead of touching the raw rows. Weighted groups are
+resampled at their Kish effective sample size and weighted proportion.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+
+# Segments resampled together with one generator. Fixed so the random stream
+# a segment draws from never depends on how many workers are used.
+SEGMENT_CHUNK_SIZE = 16
+
+# Benchmark metric -> boolean column whose mean is the metric
+PROPORTION_METRICS = {
+    'ai_adoption_rate': 'is_ai_user',
+    'worry_sentiment': 'is_worried',
+    'policy_adoption': 'org_has_ai_policy'
+}
+
+# Adoption rate of trained minus untrained respondents
+TRAINING_METRIC = 'training_effectiveness'
+TRAINING_COLUMN = 'ai_training_received'
+TRAINING_OUTCOME = 'is_ai_user'
+
+OVERALL_SEGMENT = 'All'
+
+# ============================================================================
+# SUFFICIENT STATISTICS
+# ============================================================================
+
+def sufficient_statistics(df, segment_col=None, weight_col=None):
+    """Aggregate the per-segment counts every benchmark metric needs
+
+    Returns one row per segment with ``<metric>_n``/``<metric>_k``/``<metric>_w2``
+    (total weight, weight of positives, sum of squared weights) for the
+    proportion metrics, and the same under ``<metric>_1``/``<metric>_0``
+    (trained/untrained) for the training effect. Without ``weight_col`` every respondent weighs 1,
+    so ``_n`` and ``_k`` are plain counts.
+    """
+    if segment_col:
+        segments = df[segment_col].fillna('Unknown').astype(str)
+    else:
+        segments = pd.Series(OVERALL_SEGMENT, index=df.index)
+
+    if weight_col:
+        weight = df[weight_col].fillna(0).to_numpy(dtype=float)
+    else:
+        weight = np.ones(len(df))
+
+    counts = pd.DataFrame({'segment': segments.to_numpy()})
+
+    def add_group(prefix, in_group, positive):
+        group_weight = np.where(in_group, weight, 0.0)
+        counts[f'{prefix}_n'] = group_weight
+        counts[f'{prefix}_k'] = np.where(positive, group_weight, 0.0)
+        counts[f'{prefix}_w2'] = group_weight ** 2
+
+    for metric, col in PROPORTION_METRICS.items():
+        if col in df.columns:
+            flag = df[col].fillna(False).astype(bool).to_numpy()
+            add_group(metric, True, flag)
+
+    if TRAINING_COLUMN in df.columns and TRAINING_OUTCOME in df.columns:
+        trained = df[TRAINING_COLUMN].fillna(False).astype(bool).to_numpy()
+        outcome = df[TRAINING_OUTCOME].fillna(False).astype(bool).to_numpy()
+        add_group(f'{TRAINING_METRIC}_1', trained, outcome)
+        add_group(f'{TRAINING_METRIC}_0', ~trained, outcome)
+
+    return counts.groupby('segment', sort=True).sum()
+
+def _effective_counts(counts, prefix):
+    """Kish effective sample size and weighted proportion of a group
+
+    With unit weights the effective size is the respondent count.
+    """
+    n = counts[f'{prefix}_n'].to_numpy(dtype=float)
+    k = counts[f'{prefix}_k'].to_numpy(dtype=float)
+    w2 = counts[f'{prefix}_w2'].to_numpy(dtype=float)
+    effective_n = np.rint(_rate(n ** 2, w2)).astype(np.int64)
+    return _rate(k, n) * effective_n, effective_n
+
+# ============================================================================
+# BATCHED RESAMPLING
+# ============================================================================
+
+def _rate(successes, totals):
+    """Proportion per segment, 0 for empty segments"""
+    return np.divide(successes, totals, out=np.zeros(len(totals), dtype=float),
+                     where=totals > 0)
+
+def _draw_proportion(rng, successes, totals, n_resamples):
+    """Bootstrap percentages, shape (n_resamples, n_segments)"""
+    totals = np.asarray(totals, dtype=np.int64)
+    p = _rate(np.asarray(successes, dtype=float), totals)
+    draws = rng.binomial(totals, p, size=(n_resamples, len(totals)))
+    return draws / np.maximum(totals, 1) * 100
+
+def _draw_difference(rng, k1, n1, k0, n0, n_resamples):
+    """Bootstrap difference of percentages, resampling each group separately"""
+    return (_draw_proportion(rng, k1, n1, n_resamples) -
+            _draw_proportion(rng, k0, n0, n_resamples))
+
+def _bootstrap_segments(draw, arrays, n_resamples, confidence, seed, max_workers):
+    """Run ``draw`` over chunks of segments in parallel and return CI bounds
+
+    Segments are split into fixed-size chunks, each with its own generator
+    spawned from ``seed``, so the worker count only affects scheduling and the
+    results are reproducible on any machine. NumPy releases the GIL while
+    sampling, so threads run the chunks concurrently.
+    """
+    n_segments = len(arrays[0])
+    lower = np.full(n_segments, np.nan)
+    upper = np.full(n_segments, np.nan)
+    if n_segments == 0:
+        return lower, upper
+
+    chunks = [np.arange(start, min(start + SEGMENT_CHUNK_SIZE, n_segments))
+              for start in range(0, n_segments, SEGMENT_CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(chunks)))
+    alpha = (1 - confidence) / 2
+
+    def run(idx, seed_seq):
+        rng = np.random.default_rng(seed_seq)
+        samples = draw(rng, *[a[idx] for a in arrays], n_resamples)
+        lower[idx], upper[idx] = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(run, chunks, seeds))
+
+    return lower, upper
+
+# ============================================================================
+# SIGNIFICANCE TESTS
+# ============================================================================
+
+def _nearest_bound(value, min_bench, max_bench):
+    """Benchmark bound closest to each value (the value itself if inside)"""
+    return np.clip(value, min_bench, max_bench)
+
+def _p_value(value, bound, std_error):
+    """Two-sided normal-approximation p-value of value != bound"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(std_error > 0, (value - bound) / std_error, 0.0)
+    return 2 * stats.norm.sf(np.abs(z))
+
+def interval_status(ci_lower, ci_upper, min_bench, max_bench):
+    """PASS when the confidence interval overlaps the benchmark range
+
+    Segments where the metric is undefined (NaN interval) are UNAVAILABLE.
+    """
+    ci_lower = np.asarray(ci_lower, dtype=float)
+    ci_upper = np.asarray(ci_upper, dtype=float)
+    overlaps = (ci_upper >= min_bench) & (ci_lower <= max_bench)
+    status = np.where(overlaps, 'PASS', 'WARNING')
+    return np.where(np.isnan(ci_lower) | np.isnan(ci_upper), 'UNAVAILABLE', status)
+
+# ============================================================================
+# METRIC INTERVALS
+# ============================================================================
+
+def _proportion_interval(counts, metric, benchmark, n_resamples, confidence,
+                         seed, max_workers):
+    k, n = _effective_counts(counts, metric)
+    value = _rate(k, n) * 100
+    lower, upper = _bootstrap_segments(_draw_proportion, [k, n], n_resamples,
+                                       confidence, seed, max_workers)
+    value, lower, upper = (np.where(n == 0, np.nan, a) for a in (value, lower, upper))
+
+    # Standard error under the nearest benchmark bound (one-sample z-test)
+    bound = _nearest_bound(value, *benchmark)
+    std_error = np.sqrt(bound * (100 - bound) / np.maximum(n, 1))
+    return value, lower, upper, _p_value(value, bound, std_error), n
+
+def _difference_interval(counts, metric, benchmark, n_resamples, confidence,
+                         seed, max_workers):
+    k1, n1 = _effective_counts(counts, f'{metric}_1')
+    k0, n0 = _effective_counts(counts, f'{metric}_0')
+    p1 = _rate(k1, n1) * 100
+    p0 = _rate(k0, n0) * 100
+    value = p1 - p0
+    lower, upper = _bootstrap_segments(_draw_difference, [k1, n1, k0, n0],
+                                       n_resamples, confidence, seed, max_workers)
+
+    # Unpooled two-sample standard error of the difference
+    bound = _nearest_bound(value, *benchmark)
+    std_error = np.sqrt(p1 * (100 - p1) / np.maximum(n1, 1) +
+                        p0 * (100 - p0) / np.maximum(n0, 1))
+    # A group with no respondents makes the difference undefined
+    undefined = (n1 == 0) | (n0 == 0)
+    value, lower, upper = (np.where(undefined, np.nan, a) for a in (value, lower, upper))
+    return value, lower, upper, _p_value(value, bound, std_error), n1 + n0
+
+def bootstrap_benchmark_metrics(counts, benchmarks, n_resamples=DEFAULT_RESAMPLES,
+                                confidence=DEFAULT_CONFIDENCE, seed=None,
+                                max_workers=None):
+    """Bootstrap CI, p-value and interval-aware status for each benchmark metric
+
+    ``counts`` is the output of :func:`sufficient_statistics`. Returns a dict of
+    metric -> DataFrame indexed by segment with columns value, ci_lower,
+    ci_upper, p_value (departure from the nearest benchmark bound), n
+    (effective sample size) and status. Metrics whose columns are missing from ``counts`` are skipped.
+    """
+    results = {}
+    for metric, benchmark in benchmarks.items():
+        if metric in PROPORTION_METRICS and f'{metric}_n' in counts.columns:
+            interval = _proportion_interval
+        elif metric == TRAINING_METRIC and f'{metric}_1_n' in counts.columns:
+            interval = _difference_interval
+        else:
+            continue
+
+        value, lower, upper, p_value, n = interval(
+            counts, metric, benchmark, n_resamples, confidence, seed, max_workers
+        )
+        results[metric] = pd.DataFrame({
+            'value': value,
+            'ci_lower': lower,
+            'ci_upper': upper,
+            'p_value': p_value,
+            'n': n,
+            'status': interval_status(lower, upper, *benchmark)
+        }, index=counts.index)
+
+    return results
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+AI Workforce Analytics Platform - Checkpointed Database Loads
+============================================================================
+Description: Resumable batch loading into Neon PostgreSQL with a load
+             manifest, so a failed load only has to redo missing batches
+Author: Group 14
+Version: 1.0
+============================================================================
+
+Each batch is written in its own transaction together with a row in the
+load manifest recording its source offset and a hash of its rows. A rerun of
+the same load skips every batch already in the manifest. A batch's rows and
+its manifest row commit together, so when the load reset the table a batch
+missing from the manifest has no rows there and re-sending it is idempotent.
+Appending loads first delete rows with the batch's keys instead.
+"""
+
+import hashlib
+import time
+
+import pandas as pd
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+MANIFEST_TABLE = 'etl_load_manifest'
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_RETRIES = 3
+RETRY_DELAY_SECONDS = 5
+
+# How the target table is reset when a load starts from scratch:
+#   'replace'  - drop and recreate from the DataFrame columns
+#   'truncate' - keep the table definition, remove all rows
+#   'append'   - leave existing rows in place
+LOAD_MODES = ('replace', 'truncate', 'append')
+
+MANIFEST_DDL = f"""
+CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+    load_key TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    batch_index INTEGER NOT NULL,
+    source_file TEXT,
+    source_offset BIGINT NOT NULL,
+    row_count INTEGER NOT NULL,
+    row_hash TEXT NOT NULL,
+    committed_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (load_key, batch_index)
+);
+"""
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+def frame_hash(df):
+    """Stable SHA-256 of a DataFrame's columns and values"""
+    digest = hashlib.sha256('|'.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def make_load_key(df, table_name, batch_size):
+    """Identify a load by its target, batch layout and data
+
+    The source path is left out so the same data resumes the same load
+    whichever working directory the loader runs from.
+    """
+    key = f"{table_name}|{batch_size}|{frame_hash(df)}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+
+def ensure_manifest(engine):
+    """Create the load manifest table if it does not exist"""
+    with engine.begin() as conn:
+        conn.execute(text(MANIFEST_DDL))
+
+def committed_batches(engine, load_key):
+    """Map of batch_index -> row_hash for batches already committed"""
+    with engine.connect() as conn:
+        result = conn.execute(
+            text(f"SELECT batch_index, row_hash FROM {MANIFEST_TABLE} WHERE load_key = :load_key"),
+            {'load_key': load_key}
+        )
+        return {row.batch_index: row.row_hash for row in result}
+
+def _record_batch(conn, load_key, table_name, batch_index, source_file,
+                  source_offset, row_count, row_hash):
+    conn.execute(text(f"""
+        INSERT INTO {MANIFEST_TABLE}
+            (load_key, table_name, batch_index, source_file, source_offset, row_count, row_hash)
+        VALUES
+            (:load_key, :table_name, :batch_index, :source_file, :source_offset, :row_count, :row_hash)
+        ON CONFLICT (load_key, batch_index) DO UPDATE SET
+            source_offset = EXCLUDED.source_offset,
+            row_count = EXCLUDED.row_count,
+            row_hash = EXCLUDED.row_hash,
+            committed_at = CURRENT_TIMESTAMP
+    """), {
+        'load_key': load_key,
+        'table_name': table_name,
+        'batch_index': batch_index,
+        'source_file': source_file,
+        'source_offset': source_offset,
+        'row_count': row_count,
+        'row_hash': row_hash
+    })
+
+# ============================================================================
+# BATCH LOADING
+# ============================================================================
+
+def _reset_table(conn, df, table_name, key_column, mode, load_key):
+    """Prepare the target table for a load that is starting from scratch
+
+    Runs in the same transaction as the first batch, so a failure before that
+    batch commits leaves the previous data in place.
+    """
+    if mode == 'replace' or not inspect(conn).has_table(table_name):
+        df.head(0).to_sql(table_name, conn, if_exists='replace', index=False)
+        conn.execute(text(f"CREATE INDEX idx_{table_name}_{key_column} ON {table_name} ({key_column});"))
+    elif mode == 'truncate':
+        conn.execute(text(f"TRUNCATE TABLE {table_name} RESTART IDENTITY CASCADE;"))
+
+    # Earlier loads into this table no longer describe its contents
+    if mode != 'append':
+        conn.execute(
+            text(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = :table_name AND load_key <> :load_key"),
+            {'table_name': table_name, 'load_key': load_key}
+        )
+
+def _delete_keys(conn, batch, table_name, key_column):
+    """Remove existing rows with the batch's keys (``key_column`` should be indexed)"""
+    conn.execute(
+        text(f"DELETE FROM {table_name} WHERE {key_column} = ANY(:keys)"),
+        {'keys': batch[key_column].tolist()}
+    )
+
+def _insert_batch(conn, batch, table_name):
+    """Append a batch, raising the driver error rather than pandas' wrapper of it"""
+    try:
+        batch.to_sql(table_name, conn, if_exists='append', index=False, method='multi')
+    except pd.errors.DatabaseError as e:
+        if isinstance(e.__cause__, DBAPIError):
+            raise e.__cause__ from None
+        raise
+
+def _load_missing_batches(engine, df, table_name, key_column, source_file,
+                          batch_size, mode, load_key):
+    """Load every batch not yet in the manifest, one transaction per batch"""
+    done = committed_batches(engine, load_key)
+    loaded = skipped = 0
+
+    # An empty load still has to clear out whatever the table held before
+    if len(df) == 0 and mode != 'append':
+        with engine.begin() as conn:
+            _reset_table(conn, df, table_name, key_column, mode, load_key)
+        return loaded, skipped
+
+    for batch_index, start in enumerate(range(0, len(df), batch_size)):
+        batch = df.iloc[start:start + batch_size]
+        row_hash = frame_hash(batch)
+        if done.get(batch_index) == row_hash:
+            skipped += 1
+            continue
+
+        with engine.begin() as conn:
+            if batch_index == 0 and not done:
+                _reset_table(conn, df, table_name, key_column, mode, load_key)
+            if mode == 'append':
+                _delete_keys(conn, batch, table_name, key_column)
+            _insert_batch(conn, batch, table_name)
+            _record_batch(conn, load_key, table_name, batch_index, source_file,
+                          start, len(batch), row_hash)
+        loaded += 1
+
+    return loaded, skipped
+
+def _is_transient(error):
+    """Connection-level failures are worth retrying; data and SQL errors are not"""
+    return (isinstance(error, (OperationalError, InterfaceError)) or
+            error.connection_invalidated)
+
+def load_in_batches(df, engine, table_name, key_column='respondent_id', source_file=None,
+                    batch_size=DEFAULT_BATCH_SIZE, mode='replace', retries=DEFAULT_RETRIES):
+    """Load a DataFrame in checkpointed batches, resuming any earlier attempt
+
+    A load is identified by the table, batch size and data, so rerunning the
+    same load after a failure only sends the batches that did not commit.
+    Connection errors are retried up to ``retries`` times, each retry resuming
+    from the manifest; other database errors are raised at once.
+
+    Returns a summary dict with the number of batches loaded and skipped.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"mode must be one of {LOAD_MODES}, got {mode!r}")
+    if key_column not in df.columns:
+        raise ValueError(f"key column {key_column!r} not in DataFrame")
+
+    ensure_manifest(engine)
+    load_key = make_load_key(df, table_name, batch_size)
+    total_batches = -(-len(df) // batch_size)
+    summary = {'load_key': load_key, 'batches': total_batches, 'loaded': 0, 'skipped': 0}
+
+    for attempt in range(retries + 1):
+        try:
+            loaded, skipped = _load_missing_batches(
+                engine, df, table_name, key_column, source_file, batch_size, mode, load_key
+            )
+            summary['loaded'] = loaded
+            summary['skipped'] = skipped
+            return summary
+        except DBAPIError as e:
+            if not _is_transient(e) or attempt == retries:
+                raise
+            print(f"⚠ Batch load interrupted ({str(e).splitlines()[0][:200]}), "
+                  f"retrying in {RETRY_DELAY_SECONDS}s ({attempt + 1}/{retries})")
+            engine.dispose()
+            time.sleep(RETRY_DELAY_SECONDS)
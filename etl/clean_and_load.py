@@ -17,6 +17,11 @@ import sys
 from datetime import datetime
 import json
 
+from benchmark_stats import bootstrap_benchmark_metrics, sufficient_statistics
+from checkpointed_load import load_in_batches
+from survey_weights import (WEIGHT_COLUMN, POPULATION_MARGINS, rake_weights,
+                            standardize_education, weight_summary)
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -45,6 +50,21 @@ BENCHMARKS = {
     'training_effectiveness': (20, 30)  # MIT/IBM 2024: 20-30%
 }
 
+# Bootstrap settings for benchmark confidence intervals
+BOOTSTRAP_RESAMPLES = 10000
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 14
+
+# Seed for values filled in during cleaning, so a rerun produces identical
+# rows and can resume an interrupted database load
+RANDOM_SEED = 14
+
+# Rows per committed batch when loading to the database
+LOAD_BATCH_SIZE = 5000
+
+# Columns to break the benchmark checks down by
+BENCHMARK_SEGMENTS = ['industry_sector', 'age_bracket', 'geographic_region', 'education_level']
+
 # ============================================================================
 # DATA READING
 # ============================================================================
@@ -98,6 +118,7 @@ def fix_age_experience_mismatch(df):
     }
     
     issues_fixed = 0
+    rng = np.random.default_rng(RANDOM_SEED)
     
     if 'age_group' in df.columns and 'years_experience' in df.columns:
         for age_group, max_exp in age_max_experience.items():
@@ -105,7 +126,7 @@ def fix_age_experience_mismatch(df):
             count = mask.sum()
             if count > 0:
                 print(f"✓ Fixed {count} records in age group '{age_group}' with experience > {max_exp}")
-                df.loc[mask, 'years_experience'] = np.random.randint(0, max_exp + 1, size=count)
+                df.loc[mask, 'years_experience'] = rng.integers(0, max_exp + 1, size=count)
                 issues_fixed += count
     
     print(f"\n✓ Total issues fixed: {issues_fixed}")
@@ -155,18 +176,7 @@ def standardize_categorical_fields(df):
     
     # Education Level
     if 'education_level' in df.columns:
-        education_map = {
-            'high school': 'High School',
-            'some college': 'Some College',
-            'bachelor': 'Bachelor',
-            'bachelors': 'Bachelor',
-            'master': 'Master',
-            'masters': 'Master',
-            'phd': 'PhD',
-            'doctorate': 'PhD'
-        }
-        df['education_level'] = df['education_level'].astype(str).str.lower().str.strip()
-        df['education_level'] = df['education_level'].map(education_map).fillna(df['education_level'])
+        df['education_level'] = standardize_education(df['education_level'])
         print(f"✓ Standardized: education_level")
     
     # Company Size
@@ -269,67 +279,119 @@ def generate_respondent_ids(df):
     
     return df
 
+# ============================================================================
+# SURVEY WEIGHTING
+# ============================================================================
+
+def compute_survey_weights(df):
+    """Rake respondents to the workforce population margins"""
+    print("\n" + "="*80)
+    print("STEP 8: COMPUTING SURVEY WEIGHTS")
+    print("="*80)
+    
+    weights, diagnostics = rake_weights(df, POPULATION_MARGINS)
+    df[WEIGHT_COLUMN] = weights
+    
+    if not diagnostics['variables']:
+        print("⚠ No weighting variables found, all weights set to 1")
+        return df
+    
+    print(f"✓ Raked on: {', '.join(diagnostics['variables'])}")
+    status = "✓" if diagnostics['converged'] else "⚠"
+    print(f"{status} Converged: {diagnostics['converged']} after {diagnostics['iterations']} iterations "
+          f"(max margin error: {diagnostics['max_margin_error']:.2e})")
+    for var, categories in diagnostics['dropped_categories'].items():
+        print(f"⚠ No respondents for {var}: {', '.join(categories)}")
+    if diagnostics['unweighted_rows'] > 0:
+        print(f"⚠ {diagnostics['unweighted_rows']} rows outside the population margins kept weight 1")
+    
+    summary = weight_summary(df[WEIGHT_COLUMN])
+    print(f"✓ Weight range: {summary['min']:.3f}-{summary['max']:.3f}, "
+          f"design effect: {summary['design_effect']:.2f}, "
+          f"effective sample size: {summary['effective_sample_size']:.0f}")
+    
+    return df
+
 # ============================================================================
 # VALIDATION FUNCTIONS
 # ============================================================================
 
 def validate_against_benchmarks(df):
-    """Validate dataset against research benchmarks"""
+    """Validate weighted dataset against research benchmarks with bootstrap confidence intervals"""
     print("\n" + "="*80)
-    print("STEP 8: VALIDATING AGAINST RESEARCH BENCHMARKS")
+    print("STEP 9: VALIDATING AGAINST RESEARCH BENCHMARKS")
     print("="*80)
     
-    validation_results = {}
+    weight_col = WEIGHT_COLUMN if WEIGHT_COLUMN in df.columns else None
     
-    # AI Adoption Rate
-    if 'is_ai_user' in df.columns:
-        adoption_rate = df['is_ai_user'].mean() * 100
-        min_bench, max_bench = BENCHMARKS['ai_adoption_rate']
-        status = "✓" if min_bench <= adoption_rate <= max_bench else "✗"
-        validation_results['ai_adoption_rate'] = {
-            'value': adoption_rate,
-            'benchmark': f"{min_bench}-{max_bench}%",
-            'status': 'PASS' if status == "✓" else 'WARNING'
-        }
-        print(f"{status} AI Adoption Rate: {adoption_rate:.2f}% (benchmark: {min_bench}-{max_bench}%)")
-    
-    # Worry Sentiment
-    if 'is_worried' in df.columns:
-        worry_rate = df['is_worried'].mean() * 100
-        min_bench, max_bench = BENCHMARKS['worry_sentiment']
-        status = "✓" if min_bench <= worry_rate <= max_bench else "✗"
-        validation_results['worry_sentiment'] = {
-            'value': worry_rate,
-            'benchmark': f"{min_bench}-{max_bench}%",
-            'status': 'PASS' if status == "✓" else 'WARNING'
-        }
-        print(f"{status} Worry Sentiment: {worry_rate:.2f}% (benchmark: {min_bench}-{max_bench}%)")
-    
-    # Policy Adoption
-    if 'org_has_ai_policy' in df.columns:
-        policy_rate = df['org_has_ai_policy'].mean() * 100
-        min_bench, max_bench = BENCHMARKS['policy_adoption']
-        status = "✓" if min_bench <= policy_rate <= max_bench else "✗"
-        validation_results['policy_adoption'] = {
-            'value': policy_rate,
+    # Resample per-segment counts rather than rows, so this scales with the
+    # number of segments instead of the number of respondents
+    overall = bootstrap_benchmark_metrics(
+        sufficient_statistics(df, weight_col=weight_col), BENCHMARKS,
+        n_resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE, seed=BOOTSTRAP_SEED
+    )
+    
+    labels = {
+        'ai_adoption_rate': 'AI Adoption Rate',
+        'worry_sentiment': 'Worry Sentiment',
+        'policy_adoption': 'Policy Adoption',
+        'training_effectiveness': 'Training Impact'
+    }
+    
+    validation_results = {}
+    if not overall:
+        print("⚠ No benchmark metric columns found, benchmark checks skipped")
+    
+    for metric, results in overall.items():
+        min_bench, max_bench = BENCHMARKS[metric]
+        # No rows, or the metric is undefined (e.g. nobody trained)
+        if results.empty or np.isnan(results['value'].iloc[0]):
+            validation_results[metric] = {
+                'value': None,
+                'benchmark': f"{min_bench}-{max_bench}%",
+                'status': 'UNAVAILABLE'
+            }
+            print(f"⚠ {labels[metric]}: no data (benchmark: {min_bench}-{max_bench}%)")
+            continue
+        row = results.iloc[0]
+        status = "✓" if row['status'] == 'PASS' else "✗"
+        validation_results[metric] = {
+            'value': float(row['value']),
+            'ci_lower': float(row['ci_lower']),
+            'ci_upper': float(row['ci_upper']),
+            'confidence': BOOTSTRAP_CONFIDENCE,
+            'effective_n': float(row['n']),
+            'weighted': weight_col is not None,
+            'p_value': float(row['p_value']),
             'benchmark': f"{min_bench}-{max_bench}%",
-            'status': 'PASS' if status == "✓" else 'WARNING'
+            'status': row['status']
         }
-        print(f"{status} Policy Adoption: {policy_rate:.2f}% (benchmark: {min_bench}-{max_bench}%)")
-    
-    # Training Impact on Adoption
-    if 'ai_training_received' in df.columns and 'is_ai_user' in df.columns:
-        trained = df[df['ai_training_received'] == True]['is_ai_user'].mean() * 100
-        untrained = df[df['ai_training_received'] == False]['is_ai_user'].mean() * 100
-        improvement = trained - untrained
-        min_bench, max_bench = BENCHMARKS['training_effectiveness']
-        status = "✓" if min_bench <= improvement <= max_bench else "✗"
-        validation_results['training_effectiveness'] = {
-            'value': improvement,
-            'benchmark': f"{min_bench}-{max_bench}%",
-            'status': 'PASS' if status == "✓" else 'WARNING'
+        print(f"{status} {labels[metric]}: {row['value']:.2f}% "
+              f"[{BOOTSTRAP_CONFIDENCE:.0%} CI {row['ci_lower']:.2f}-{row['ci_upper']:.2f}%, "
+              f"p={row['p_value']:.3f}] (benchmark: {min_bench}-{max_bench}%)")
+    
+    # Per-segment breakdown
+    segment_results = {}
+    for segment_col in BENCHMARK_SEGMENTS:
+        if segment_col not in df.columns:
+            print(f"⚠ Segment breakdown by {segment_col}: column not found, skipped")
+            continue
+        by_segment = bootstrap_benchmark_metrics(
+            sufficient_statistics(df, segment_col, weight_col), BENCHMARKS,
+            n_resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE, seed=BOOTSTRAP_SEED
+        )
+        if not by_segment:
+            print(f"⚠ Segment breakdown by {segment_col}: no benchmark metrics available, skipped")
+            continue
+        segment_results[segment_col] = {
+            metric: json.loads(results.to_json(orient='index'))
+            for metric, results in by_segment.items()
         }
-        print(f"{status} Training Impact: +{improvement:.2f}% adoption (benchmark: {min_bench}-{max_bench}%)")
+        warnings = sum((results['status'] == 'WARNING').sum() for results in by_segment.values())
+        print(f"✓ Segment breakdown by {segment_col}: {warnings} metric/segment warnings")
+    
+    if segment_results:
+        validation_results['segments'] = segment_results
     
     # Save validation results
     validation_file = os.path.join(os.path.dirname(__file__), 'validation_results.json')
@@ -342,7 +404,7 @@ def validate_against_benchmarks(df):
 def generate_data_quality_report(df):
     """Generate comprehensive data quality report"""
     print("\n" + "="*80)
-    print("STEP 9: DATA QUALITY REPORT")
+    print("STEP 10: DATA QUALITY REPORT")
     print("="*80)
     
     report = {
@@ -353,9 +415,30 @@ def generate_data_quality_report(df):
         'data_types': df.dtypes.astype(str).to_dict()
     }
     
+    if WEIGHT_COLUMN in df.columns:
+        weights = df[WEIGHT_COLUMN]
+        report['weighting'] = weight_summary(weights)
+        # Weighted vs unweighted shares for each weighting variable
+        report['weighted_distributions'] = {}
+        for var, margin in POPULATION_MARGINS.items():
+            if var not in df.columns:
+                continue
+            # Only rows inside the margin's categories are raked to it
+            in_margin = df[var].isin(list(margin))
+            values = df.loc[in_margin, var]
+            margin_weights = weights[in_margin]
+            report['weighted_distributions'][var] = {
+                'unweighted': values.value_counts(normalize=True).to_dict(),
+                'weighted': (margin_weights.groupby(values).sum() / margin_weights.sum()).to_dict(),
+                'population': margin
+            }
+    
     print(f"✓ Total Rows: {report['total_rows']}")
     print(f"✓ Total Columns: {report['total_columns']}")
     print(f"✓ Duplicate Respondents: {report['duplicate_respondents']}")
+    if 'weighting' in report:
+        print(f"✓ Effective Sample Size: {report['weighting']['effective_sample_size']:.0f} "
+              f"(design effect: {report['weighting']['design_effect']:.2f})")
     
     missing_count = sum(report['missing_values'].values())
     if missing_count > 0:
@@ -378,10 +461,10 @@ def generate_data_quality_report(df):
 # DATABASE LOADING
 # ============================================================================
 
-def load_to_database(df, database_url):
-    """Load cleaned data into Neon PostgreSQL"""
+def load_to_database(df, database_url, source_file=None):
+    """Load cleaned data into Neon PostgreSQL, resuming a previously interrupted load"""
     print("\n" + "="*80)
-    print("STEP 10: LOADING DATA TO NEON DATABASE")
+    print("STEP 11: LOADING DATA TO NEON DATABASE")
     print("="*80)
     
     try:
@@ -389,9 +472,12 @@ def load_to_database(df, database_url):
         engine = create_engine(database_url)
         print(f"✓ Connected to database")
         
-        # Drop existing data and load new data
-        df.to_sql('survey_respondents', engine, if_exists='replace', index=False, method='multi')
-        print(f"✓ Loaded {len(df)} rows to survey_respondents table")
+        # Replace existing data in checkpointed batches
+        summary = load_in_batches(df, engine, 'survey_respondents', source_file=source_file,
+                                  batch_size=LOAD_BATCH_SIZE, mode='replace')
+        if summary['skipped']:
+            print(f"✓ Resumed load: {summary['skipped']} of {summary['batches']} batches already committed")
+        print(f"✓ Loaded {len(df)} rows to survey_respondents table ({summary['loaded']} batches sent)")
         
         # Verify load
         verification_query = "SELECT COUNT(*) as count FROM survey_respondents;"
@@ -429,7 +515,10 @@ def main():
         df = validate_numeric_ranges(df)
         df = generate_respondent_ids(df)
         
-        # Step 8-9: Validate data
+        # Step 8: Post-stratification weights
+        df = compute_survey_weights(df)
+        
+        # Step 9-10: Validate data
         validation_results = validate_against_benchmarks(df)
         quality_report = generate_data_quality_report(df)
         
@@ -438,8 +527,8 @@ def main():
         df.to_csv(output_file, index=False)
         print(f"\n✓ Cleaned data saved to: {output_file}")
         
-        # Step 10: Load to database
-        success = load_to_database(df, DATABASE_URL)
+        # Step 11: Load to database
+        success = load_to_database(df, DATABASE_URL, source_file=output_file)
         
         if success:
             print("\n" + "="*80)
@@ -6,6 +6,8 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 import os
 
+from checkpointed_load import load_in_batches
+
 database_url = os.getenv('DATABASE_URL')
 if not database_url:
     print("ERROR: DATABASE_URL not set")
@@ -26,7 +28,7 @@ schema_columns = [
     'workflow_automation_potential', 'org_ai_adoption_level',
     'org_ai_investment_trend', 'org_has_ai_policy', 
     'org_ai_sustainability_use', 'wage_premium_ai_skills', 
-    'productivity_change'
+    'productivity_change', 'survey_weight'
 ]
 
 # Filter to only columns that exist in both dataframe and schema
@@ -38,13 +40,12 @@ print(f"Using {len(available_columns)} columns from schema")
 print("Connecting to database...")
 engine = create_engine(database_url)
 
-print("Truncating existing data...")
-with engine.connect() as conn:
-    conn.execute(text("TRUNCATE TABLE survey_respondents RESTART IDENTITY CASCADE;"))
-    conn.commit()
-
-print("Loading data...")
-df_filtered.to_sql('survey_respondents', engine, if_exists='append', index=False, method='multi')
+print("Loading data in checkpointed batches...")
+summary = load_in_batches(df_filtered, engine, 'survey_respondents',
+                          source_file='etl/cleaned_survey_data.csv', mode='truncate')
+if summary['skipped']:
+    print(f"✓ Resumed load: {summary['skipped']} of {summary['batches']} batches already committed")
+print(f"✓ Sent {summary['loaded']} batches")
 
 # Verify
 with engine.connect() as conn:
@@ -7,11 +7,17 @@ import numpy as np
 from sqlalchemy import create_engine, text
 import os
 
+from checkpointed_load import load_in_batches
+from survey_weights import WEIGHT_COLUMN, rake_weights, standardize_education
+
 database_url = os.getenv('DATABASE_URL')
 if not database_url:
     print("ERROR: DATABASE_URL not set")
     exit(1)
 
+# Fixed seed so a rerun generates the same rows and can resume a failed load
+np.random.seed(14)
+
 print("Reading survey empirical responses...")
 df = pd.read_csv('Data/survey_empirical_responses.csv')
 print(f"Loaded {len(df)} rows")
@@ -34,7 +40,7 @@ elif 'age_group' in df.columns:
     df_mapped['age_group'] = df['age_group']
 
 if 'education_level' in df.columns:
-    df_mapped['education_level'] = df['education_level']
+    df_mapped['education_level'] = standardize_education(df['education_level'])
 
 if 'income_bracket' in df.columns:
     df_mapped['income_level'] = df['income_bracket'].apply(lambda x: 50000 if pd.isna(x) else 50000)
@@ -96,18 +102,26 @@ if 'self_reported_productivity_change_pct' in df.columns:
 else:
     df_mapped['productivity_change'] = np.random.uniform(-10, 30, len(df))
 
+# Post-stratification weights from the source demographics
+weighting_df = df.copy()
+if 'education_level' in df_mapped.columns:
+    weighting_df['education_level'] = df_mapped['education_level']
+weights, diagnostics = rake_weights(weighting_df)
+df_mapped[WEIGHT_COLUMN] = weights.to_numpy()
+print(f"✓ Survey weights raked on {', '.join(diagnostics['variables'])} "
+      f"(converged: {diagnostics['converged']}, {diagnostics['unweighted_rows']} rows unweighted)")
+
 print(f"\nMapped data has {len(df_mapped)} rows and {len(df_mapped.columns)} columns")
 
 print("\nConnecting to database...")
 engine = create_engine(database_url)
 
-print("Truncating existing data...")
-with engine.connect() as conn:
-    conn.execute(text("TRUNCATE TABLE survey_respondents RESTART IDENTITY CASCADE;"))
-    conn.commit()
-
-print("Loading data...")
-df_mapped.to_sql('survey_respondents', engine, if_exists='append', index=False, method='multi')
+print("Loading data in checkpointed batches...")
+summary = load_in_batches(df_mapped, engine, 'survey_respondents',
+                          source_file='Data/survey_empirical_responses.csv', mode='truncate')
+if summary['skipped']:
+    print(f"✓ Resumed load: {summary['skipped']} of {summary['batches']} batches already committed")
+print(f"✓ Sent {summary['loaded']} batches")
 
 # Verify
 with engine.connect() as conn:
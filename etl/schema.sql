@@ -76,6 +76,11 @@ CREATE TABLE survey_respondents (
     wage_premium_ai_skills NUMERIC CHECK (wage_premium_ai_skills >= 0 AND wage_premium_ai_skills <= 500000),
     productivity_change NUMERIC CHECK (productivity_change >= -100 AND productivity_change <= 100),
     
+    -- ========================================================================
+    -- SURVEY WEIGHTING
+    -- ========================================================================
+    survey_weight NUMERIC NOT NULL DEFAULT 1 CHECK (survey_weight > 0),
+    
     -- ========================================================================
     -- SYSTEM METADATA
     -- ========================================================================
@@ -83,6 +88,25 @@ CREATE TABLE survey_respondents (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- ============================================================================
+-- Load Manifest (checkpointed ETL loads)
+-- ============================================================================
+-- One row per committed load batch; recreated with survey_respondents so a
+-- fresh schema never skips batches from an earlier load
+DROP TABLE IF EXISTS etl_load_manifest;
+
+CREATE TABLE etl_load_manifest (
+    load_key TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    batch_index INTEGER NOT NULL,
+    source_file TEXT,
+    source_offset BIGINT NOT NULL,
+    row_count INTEGER NOT NULL,
+    row_hash TEXT NOT NULL,
+    committed_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (load_key, batch_index)
+);
+
 -- ============================================================================
 -- INDEXES for Performance Optimization
 -- ============================================================================
@@ -132,17 +156,19 @@ CREATE TRIGGER update_survey_respondents_updated_at
 -- ============================================================================
 -- VIEWS for Common Analytics Queries
 -- ============================================================================
+-- Percentages and averages are weighted by survey_weight so they reflect the
+-- workforce population; respondent counts stay unweighted.
 
 -- View: AI Adoption Overview
 CREATE OR REPLACE VIEW vw_ai_adoption_overview AS
 SELECT 
     COUNT(*) as total_respondents,
     SUM(CASE WHEN is_ai_user THEN 1 ELSE 0 END) as ai_users,
-    ROUND(AVG(CASE WHEN is_ai_user THEN 1 ELSE 0 END) * 100, 2) as adoption_rate_pct,
-    ROUND(AVG(productivity_change), 2) as avg_productivity_change,
-    ROUND(AVG(ai_comfort_level), 2) as avg_comfort_level,
+    ROUND(SUM(CASE WHEN is_ai_user THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as adoption_rate_pct,
+    ROUND(SUM(productivity_change * survey_weight) / NULLIF(SUM(CASE WHEN productivity_change IS NOT NULL THEN survey_weight END), 0), 2) as avg_productivity_change,
+    ROUND(SUM(ai_comfort_level * survey_weight) / NULLIF(SUM(CASE WHEN ai_comfort_level IS NOT NULL THEN survey_weight END), 0), 2) as avg_comfort_level,
     SUM(CASE WHEN ai_training_received THEN 1 ELSE 0 END) as trained_users,
-    ROUND(AVG(CASE WHEN ai_training_received THEN 1 ELSE 0 END) * 100, 2) as training_rate_pct
+    ROUND(SUM(CASE WHEN ai_training_received THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as training_rate_pct
 FROM survey_respondents;
 
 -- View: Sentiment Breakdown
@@ -150,13 +176,13 @@ CREATE OR REPLACE VIEW vw_sentiment_breakdown AS
 SELECT 
     COUNT(*) as total_respondents,
     SUM(CASE WHEN is_worried THEN 1 ELSE 0 END) as worried_count,
-    ROUND(AVG(CASE WHEN is_worried THEN 1 ELSE 0 END) * 100, 2) as worried_pct,
+    ROUND(SUM(CASE WHEN is_worried THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as worried_pct,
     SUM(CASE WHEN is_hopeful THEN 1 ELSE 0 END) as hopeful_count,
-    ROUND(AVG(CASE WHEN is_hopeful THEN 1 ELSE 0 END) * 100, 2) as hopeful_pct,
+    ROUND(SUM(CASE WHEN is_hopeful THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as hopeful_pct,
     SUM(CASE WHEN is_overwhelmed THEN 1 ELSE 0 END) as overwhelmed_count,
-    ROUND(AVG(CASE WHEN is_overwhelmed THEN 1 ELSE 0 END) * 100, 2) as overwhelmed_pct,
+    ROUND(SUM(CASE WHEN is_overwhelmed THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as overwhelmed_pct,
     SUM(CASE WHEN is_excited THEN 1 ELSE 0 END) as excited_count,
-    ROUND(AVG(CASE WHEN is_excited THEN 1 ELSE 0 END) * 100, 2) as excited_pct
+    ROUND(SUM(CASE WHEN is_excited THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as excited_pct
 FROM survey_respondents;
 
 -- View: Adoption by Company Size
@@ -165,8 +191,8 @@ SELECT
     company_size,
     COUNT(*) as total_respondents,
     SUM(CASE WHEN is_ai_user THEN 1 ELSE 0 END) as ai_users,
-    ROUND(AVG(CASE WHEN is_ai_user THEN 1 ELSE 0 END) * 100, 2) as adoption_rate_pct,
-    ROUND(AVG(productivity_change), 2) as avg_productivity_change
+    ROUND(SUM(CASE WHEN is_ai_user THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as adoption_rate_pct,
+    ROUND(SUM(productivity_change * survey_weight) / NULLIF(SUM(CASE WHEN productivity_change IS NOT NULL THEN survey_weight END), 0), 2) as avg_productivity_change
 FROM survey_respondents
 GROUP BY company_size
 ORDER BY 
@@ -183,9 +209,9 @@ SELECT
     industry_sector,
     COUNT(*) as total_respondents,
     SUM(CASE WHEN is_ai_user THEN 1 ELSE 0 END) as ai_users,
-    ROUND(AVG(CASE WHEN is_ai_user THEN 1 ELSE 0 END) * 100, 2) as adoption_rate_pct,
-    ROUND(AVG(productivity_change), 2) as avg_productivity_change,
-    ROUND(AVG(wage_premium_ai_skills), 2) as avg_wage_premium
+    ROUND(SUM(CASE WHEN is_ai_user THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as adoption_rate_pct,
+    ROUND(SUM(productivity_change * survey_weight) / NULLIF(SUM(CASE WHEN productivity_change IS NOT NULL THEN survey_weight END), 0), 2) as avg_productivity_change,
+    ROUND(SUM(wage_premium_ai_skills * survey_weight) / NULLIF(SUM(CASE WHEN wage_premium_ai_skills IS NOT NULL THEN survey_weight END), 0), 2) as avg_wage_premium
 FROM survey_respondents
 GROUP BY industry_sector
 ORDER BY adoption_rate_pct DESC;
@@ -195,10 +221,10 @@ CREATE OR REPLACE VIEW vw_training_impact AS
 SELECT 
     ai_training_received,
     COUNT(*) as respondents,
-    ROUND(AVG(CASE WHEN is_ai_user THEN 1 ELSE 0 END) * 100, 2) as adoption_rate_pct,
-    ROUND(AVG(ai_comfort_level), 2) as avg_comfort_level,
-    ROUND(AVG(productivity_change), 2) as avg_productivity_change,
-    ROUND(AVG(ai_tools_used_count), 2) as avg_tools_used
+    ROUND(SUM(CASE WHEN is_ai_user THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as adoption_rate_pct,
+    ROUND(SUM(ai_comfort_level * survey_weight) / NULLIF(SUM(CASE WHEN ai_comfort_level IS NOT NULL THEN survey_weight END), 0), 2) as avg_comfort_level,
+    ROUND(SUM(productivity_change * survey_weight) / NULLIF(SUM(CASE WHEN productivity_change IS NOT NULL THEN survey_weight END), 0), 2) as avg_productivity_change,
+    ROUND(SUM(ai_tools_used_count * survey_weight) / NULLIF(SUM(CASE WHEN ai_tools_used_count IS NOT NULL THEN survey_weight END), 0), 2) as avg_tools_used
 FROM survey_respondents
 GROUP BY ai_training_received;
 
@@ -207,9 +233,9 @@ CREATE OR REPLACE VIEW vw_org_maturity AS
 SELECT 
     org_ai_adoption_level,
     COUNT(*) as organizations,
-    ROUND(AVG(CASE WHEN org_has_ai_policy THEN 1 ELSE 0 END) * 100, 2) as policy_rate_pct,
-    ROUND(AVG(CASE WHEN org_ai_sustainability_use THEN 1 ELSE 0 END) * 100, 2) as sustainability_rate_pct,
-    ROUND(AVG(productivity_change), 2) as avg_productivity_change
+    ROUND(SUM(CASE WHEN org_has_ai_policy THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as policy_rate_pct,
+    ROUND(SUM(CASE WHEN org_ai_sustainability_use THEN survey_weight ELSE 0 END) / NULLIF(SUM(survey_weight), 0) * 100, 2) as sustainability_rate_pct,
+    ROUND(SUM(productivity_change * survey_weight) / NULLIF(SUM(CASE WHEN productivity_change IS NOT NULL THEN survey_weight END), 0), 2) as avg_productivity_change
 FROM survey_respondents
 GROUP BY org_ai_adoption_level
 ORDER BY 
@@ -283,3 +309,5 @@ COMMENT ON TABLE survey_respondents IS 'Main table storing survey responses abou
 COMMENT ON COLUMN survey_respondents.respondent_id IS 'Unique pseudonymized identifier for each respondent';
 COMMENT ON COLUMN survey_respondents.productivity_change IS 'Productivity change percentage (-100 to +100)';
 COMMENT ON COLUMN survey_respondents.wage_premium_ai_skills IS 'Estimated wage premium for AI skills in local currency';
+COMMENT ON TABLE etl_load_manifest IS 'Batches committed by checkpointed ETL loads, with source row offset and row hash, used to resume failed loads';
+COMMENT ON COLUMN survey_respondents.survey_weight IS 'Post-stratification (raking) weight matching respondents to workforce population margins';
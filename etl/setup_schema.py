@@ -32,6 +32,7 @@ with engine.connect() as conn:
         # Create table without extensions and triggers
         create_table_sql = """
         DROP TABLE IF EXISTS survey_respondents CASCADE;
+        DROP TABLE IF EXISTS etl_load_manifest;
         
         CREATE TABLE survey_respondents (
             id SERIAL PRIMARY KEY,
@@ -62,6 +63,7 @@ with engine.connect() as conn:
             org_ai_sustainability_use BOOLEAN DEFAULT FALSE,
             wage_premium_ai_skills NUMERIC,
             productivity_change NUMERIC,
+            survey_weight NUMERIC NOT NULL DEFAULT 1,
             created_at TIMESTAMP DEFAULT NOW()
         );
         """
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+AI Workforce Analytics Platform - Survey Weighting
+============================================================================
+Description: Post-stratification weights by raking (iterative proportional
+             fitting) respondents to workforce population margins
+Author: Group 14
+Version: 1.0
+============================================================================
+
+Raking only depends on how many respondents fall in each combination of the
+weighting variables, so the fit runs on the counts of the cells that occur (a few
+hundred for the default margins) and the resulting per-cell factors are mapped
+back to the rows at the end.
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+WEIGHT_COLUMN = 'survey_weight'
+
+# Population margins for the workforce (approximate shares of the US civilian
+# labor force, BLS CPS 2023). Each margin is normalized to sum to 1.
+POPULATION_MARGINS = {
+    'age_bracket': {
+        '18-24': 0.12, '25-34': 0.22, '35-44': 0.21,
+        '45-54': 0.20, '55-64': 0.17, '65+': 0.08
+    },
+    'gender': {
+        'male': 0.530, 'female': 0.465, 'nonbinary': 0.005
+    },
+    'geographic_region': {
+        'South': 0.38, 'West': 0.24, 'Midwest': 0.21, 'Northeast': 0.17
+    },
+    'education_level': {
+        'High School': 0.35, 'Some College': 0.26, 'Bachelor': 0.25,
+        'Master': 0.11, 'PhD': 0.03
+    }
+}
+
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+# Education labels (lowercased) -> schema education_level values, which the
+# education margin is keyed by
+EDUCATION_MAP = {
+    'high school': 'High School',
+    'high school or less': 'High School',
+    'some college': 'Some College',
+    'some college / associate': 'Some College',
+    'bachelor': 'Bachelor',
+    'bachelors': 'Bachelor',
+    "bachelor's": 'Bachelor',
+    'master': 'Master',
+    'masters': 'Master',
+    "master's": 'Master',
+    'phd': 'PhD',
+    'doctorate': 'PhD',
+    'doctorate/prof': 'PhD'
+}
+
+# ============================================================================
+# CATEGORY STANDARDIZATION
+# ============================================================================
+
+def standardize_education(values):
+    """Map education labels to the schema values, keeping unknown labels lowercased"""
+    values = values.astype(str).str.lower().str.strip()
+    return values.map(EDUCATION_MAP).fillna(values)
+
+# ============================================================================
+# RAKING
+# ============================================================================
+
+def _cell_codes(df, variables, margins):
+    """Encode each row as an index into the cells observed in the data
+
+    Only combinations of categories that actually occur become cells, so the
+    number of cells is bounded by the number of respondents however many
+    margins are configured. Returns the per-row cell index (-1 for rows with a
+    category outside the margins), the category code of every cell for each
+    variable, and the number of cells.
+    """
+    codes = {}
+    for var in variables:
+        category_codes = {category: code for code, category in enumerate(margins[var])}
+        codes[var] = df[var].map(category_codes).fillna(-1).to_numpy(dtype=np.int64)
+
+    matched = np.logical_and.reduce([codes[var] >= 0 for var in variables])
+    row_cells = np.full(len(df), -1, dtype=np.int64)
+    if not matched.any():
+        return row_cells, [np.zeros(0, dtype=np.int64) for _ in variables], 0
+
+    matched_codes = pd.DataFrame({var: codes[var][matched] for var in variables})
+    cells = matched_codes.groupby(variables, sort=False).ngroup().to_numpy()
+    n_cells = int(cells.max()) + 1
+    row_cells[matched] = cells
+
+    # Every row in a cell shares its categories, so any row's codes will do
+    cell_var_codes = []
+    for var in variables:
+        cell_codes = np.zeros(n_cells, dtype=np.int64)
+        cell_codes[cells] = matched_codes[var].to_numpy()
+        cell_var_codes.append(cell_codes)
+    return row_cells, cell_var_codes, n_cells
+
+def rake_weights(df, margins=POPULATION_MARGINS, max_iterations=MAX_ITERATIONS,
+                 tolerance=TOLERANCE):
+    """Compute raking weights for each respondent
+
+    Weights are scaled so they average 1 over the respondents that could be
+    weighted. Respondents with a missing or unknown category on any weighting
+    variable keep a weight of 1. Population categories with no respondents are
+    dropped from their margin, which is renormalized over the rest.
+
+    Returns (weights, diagnostics) where weights is a Series aligned with df.
+    """
+    variables = [var for var in margins if var in df.columns]
+    weights = pd.Series(1.0, index=df.index, name=WEIGHT_COLUMN)
+    diagnostics = {
+        'variables': variables,
+        'weighted_rows': 0,
+        'unweighted_rows': len(df),
+        'iterations': 0,
+        'converged': False,
+        'max_margin_error': None,
+        'dropped_categories': {}
+    }
+    if not variables or df.empty:
+        return weights, diagnostics
+
+    row_cells, cell_var_codes, n_cells = _cell_codes(df, variables, margins)
+    matched = row_cells >= 0
+    cell_counts = np.bincount(row_cells[matched], minlength=n_cells).astype(float)
+    total = cell_counts.sum()
+    diagnostics['weighted_rows'] = int(matched.sum())
+    diagnostics['unweighted_rows'] = int((~matched).sum())
+    if total == 0:
+        return weights, diagnostics
+
+    targets = []
+    for var, codes in zip(variables, cell_var_codes):
+        target = np.array(list(margins[var].values()), dtype=float)
+        present = np.bincount(codes, weights=cell_counts, minlength=len(target)) > 0
+        if not present.all():
+            categories = list(margins[var])
+            diagnostics['dropped_categories'][var] = [
+                categories[i] for i in np.flatnonzero(~present)
+            ]
+        target = np.where(present, target, 0)
+        targets.append(target / target.sum() * total)
+
+    factors = np.ones(n_cells)
+    for iteration in range(1, max_iterations + 1):
+        for codes, target in zip(cell_var_codes, targets):
+            current = np.bincount(codes, weights=cell_counts * factors, minlength=len(target))
+            adjustment = np.divide(target, current, out=np.ones_like(current), where=current > 0)
+            factors *= adjustment[codes]
+
+        error = max(
+            np.abs(np.bincount(codes, weights=cell_counts * factors, minlength=len(target)) - target).max()
+            for codes, target in zip(cell_var_codes, targets)
+        ) / total
+        if error < tolerance:
+            diagnostics['converged'] = True
+            break
+
+    diagnostics['iterations'] = iteration
+    diagnostics['max_margin_error'] = float(error)
+
+    weights[matched] = factors[row_cells[matched]]
+    return weights, diagnostics
+
+def weight_summary(weights):
+    """Summary statistics of a weight column (Kish design effect, effective n)"""
+    weights = np.asarray(weights, dtype=float)
+    total = weights.sum()
+    squares = (weights ** 2).sum()
+    effective_n = total ** 2 / squares if squares > 0 else 0.0
+    return {
+        'sum': float(total),
+        'min': float(weights.min()) if len(weights) else None,
+        'max': float(weights.max()) if len(weights) else None,
+        'effective_sample_size': float(effective_n),
+        'design_effect': float(len(weights) / effective_n) if effective_n else None
+    }
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for bootstrap confidence intervals on benchmark metrics
+"""
+import importlib
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark_stats import (
+    SEGMENT_CHUNK_SIZE,
+    bootstrap_benchmark_metrics,
+    interval_status,
+    sufficient_statistics,
+)
+
+BENCHMARKS = {
+    'ai_adoption_rate': (12, 20),
+    'worry_sentiment': (45, 60),
+    'policy_adoption': (25, 45),
+    'training_effectiveness': (20, 30)
+}
+
+
+def make_respondents(n=20000, n_segments=3, seed=0):
+    rng = np.random.default_rng(seed)
+    trained = rng.random(n) < 0.3
+    return pd.DataFrame({
+        'segment': rng.integers(0, n_segments, n).astype(str),
+        'ai_training_received': trained,
+        'is_ai_user': rng.random(n) < np.where(trained, 0.4, 0.15),
+        'is_worried': rng.random(n) < 0.5,
+        'org_has_ai_policy': rng.random(n) < 0.3
+    })
+
+
+def test_sufficient_statistics_counts():
+    df = make_respondents()
+    counts = sufficient_statistics(df, 'segment')
+
+    expected = df.groupby('segment')['is_ai_user'].agg(['size', 'sum'])
+    np.testing.assert_array_equal(counts['ai_adoption_rate_n'], expected['size'])
+    np.testing.assert_array_equal(counts['ai_adoption_rate_k'], expected['sum'])
+    np.testing.assert_array_equal(counts['ai_adoption_rate_w2'], expected['size'])
+
+    trained = df[df['ai_training_received']].groupby('segment')['is_ai_user'].sum()
+    np.testing.assert_array_equal(counts['training_effectiveness_1_k'], trained)
+
+
+def test_unit_weights_match_unweighted():
+    df = make_respondents().assign(survey_weight=1.0)
+    unweighted = bootstrap_benchmark_metrics(
+        sufficient_statistics(df, 'segment'), BENCHMARKS, n_resamples=2000, seed=1
+    )
+    weighted = bootstrap_benchmark_metrics(
+        sufficient_statistics(df, 'segment', 'survey_weight'), BENCHMARKS, n_resamples=2000, seed=1
+    )
+    assert unweighted.keys() == weighted.keys()
+    for metric in unweighted:
+        pd.testing.assert_frame_equal(unweighted[metric], weighted[metric])
+
+
+def test_ci_covers_analytic_interval():
+    n, k = 10000, 1600
+    df = pd.DataFrame({'is_ai_user': np.arange(n) < k})
+    result = bootstrap_benchmark_metrics(
+        sufficient_statistics(df), BENCHMARKS, n_resamples=10000, seed=2
+    )['ai_adoption_rate'].iloc[0]
+
+    p = k / n
+    half_width = 1.96 * np.sqrt(p * (1 - p) / n) * 100
+    assert result['value'] == 16.0
+    assert result['n'] == n
+    assert abs(result['ci_lower'] - (16.0 - half_width)) < 0.1
+    assert abs(result['ci_upper'] - (16.0 + half_width)) < 0.1
+    assert result['status'] == 'PASS'
+
+
+def test_training_effect_value_and_interval():
+    df = make_respondents(n=50000, n_segments=1)
+    result = bootstrap_benchmark_metrics(
+        sufficient_statistics(df), BENCHMARKS, n_resamples=5000, seed=3
+    )['training_effectiveness'].iloc[0]
+
+    trained = df.loc[df['ai_training_received'], 'is_ai_user'].mean() * 100
+    untrained = df.loc[~df['ai_training_received'], 'is_ai_user'].mean() * 100
+    assert np.isclose(result['value'], trained - untrained)
+    assert result['ci_lower'] < result['value'] < result['ci_upper']
+
+
+def test_results_independent_of_worker_count():
+    df = make_respondents(n_segments=3 * SEGMENT_CHUNK_SIZE + 5)
+    counts = sufficient_statistics(df, 'segment')
+
+    single = bootstrap_benchmark_metrics(counts, BENCHMARKS, n_resamples=1000,
+                                         seed=14, max_workers=1)
+    parallel = bootstrap_benchmark_metrics(counts, BENCHMARKS, n_resamples=1000,
+                                           seed=14, max_workers=4)
+    for metric in single:
+        pd.testing.assert_frame_equal(single[metric], parallel[metric])
+
+
+def test_empty_segment_is_undefined():
+    counts = sufficient_statistics(pd.DataFrame({
+        'segment': ['a', 'a', 'b'],
+        'ai_training_received': [True, False, True],
+        'is_ai_user': [True, False, True]
+    }), 'segment')
+    result = bootstrap_benchmark_metrics(counts, BENCHMARKS, n_resamples=100, seed=4)
+    training = result['training_effectiveness']
+
+    assert training.loc['a', 'value'] == 100.0
+    assert np.isnan(training.loc['b', 'value'])
+    assert training.loc['b', 'status'] == 'UNAVAILABLE'
+
+
+def test_validation_reports_undefined_metric_as_unavailable(monkeypatch, tmp_path):
+    monkeypatch.setenv('DATABASE_URL', 'postgresql://localhost/test')
+    clean_and_load = importlib.import_module('clean_and_load')
+    monkeypatch.setattr(clean_and_load, '__file__', str(tmp_path / 'clean_and_load.py'))
+    monkeypatch.setattr(clean_and_load, 'BOOTSTRAP_RESAMPLES', 200)
+
+    # Everyone trained, so the training effect is undefined
+    df = pd.DataFrame({
+        'ai_training_received': True,
+        'is_ai_user': np.arange(100) < 15,
+        'industry_sector': np.tile(['Finance', 'Retail'], 50)
+    })
+    results = clean_and_load.validate_against_benchmarks(df)
+
+    assert results['training_effectiveness'] == {
+        'value': None, 'benchmark': '20-30%', 'status': 'UNAVAILABLE'
+    }
+    assert results['ai_adoption_rate']['status'] == 'PASS'
+    # Written file is strict JSON (no bare NaN tokens)
+    with open(tmp_path / 'validation_results.json') as f:
+        json.loads(f.read(), parse_constant=lambda token: pytest.fail(f"invalid JSON token {token}"))
+
+
+def test_no_rows_gives_empty_results():
+    counts = sufficient_statistics(pd.DataFrame({'is_ai_user': pd.Series([], dtype=bool)}))
+    result = bootstrap_benchmark_metrics(counts, BENCHMARKS, n_resamples=100)
+    assert result['ai_adoption_rate'].empty
+
+
+def test_interval_status_uses_overlap():
+    status = interval_status(np.array([10.0, 21.0, 5.0, np.nan]),
+                             np.array([13.0, 25.0, 11.0, np.nan]), 12, 20)
+    assert status.tolist() == ['PASS', 'WARNING', 'WARNING', 'UNAVAILABLE']
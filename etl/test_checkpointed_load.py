@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for checkpointed, resumable database loads
+
+Runs against a temporary SQLite database configured for transactional DDL, so
+a batch, its table reset and its manifest row commit or roll back together as
+they do on PostgreSQL.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import checkpointed_load
+from checkpointed_load import MANIFEST_TABLE, load_in_batches
+
+BATCH_SIZE = 10
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpointed_load, 'RETRY_DELAY_SECONDS', 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'load.db'}")
+
+    # Let SQLAlchemy, not pysqlite, control transactions (including DDL)
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def on_begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def fail_inserts(engine):
+    """Raise ``error`` on the given (1-based) INSERTs into the target table"""
+    plan = {'calls': 0, 'fail_on': set(), 'error': OperationalError}
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('INSERT INTO RESPONDENTS'):
+            plan['calls'] += 1
+            if plan['calls'] in plan['fail_on']:
+                raise plan['error'](statement, parameters, Exception('connection dropped'))
+
+    return plan
+
+
+def make_frame(n=55, offset=0):
+    return pd.DataFrame({
+        'respondent_id': [f'RESP_{i:05d}' for i in range(n)],
+        'value': np.arange(n) + offset
+    })
+
+
+def table_counts(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT COUNT(*), COUNT(DISTINCT respondent_id), SUM(value) FROM respondents"
+        )).one()
+
+
+def manifest_keys(engine):
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text(f"SELECT load_key FROM {MANIFEST_TABLE}"))}
+
+
+def test_resume_after_failure_skips_committed_batches(engine, fail_inserts):
+    df = make_frame()
+    fail_inserts['fail_on'] = {3}
+    with pytest.raises(OperationalError):
+        load_in_batches(df, engine, 'respondents', batch_size=BATCH_SIZE, retries=0)
+    assert table_counts(engine)[0] == 2 * BATCH_SIZE
+
+    summary = load_in_batches(df, engine, 'respondents', batch_size=BATCH_SIZE, retries=0)
+
+    assert summary['batches'] == 6
+    assert summary['skipped'] == 2
+    assert summary['loaded'] == 4
+    assert tuple(table_counts(engine)) == (55, 55, df['value'].sum())
+
+
+def test_transient_error_is_retried_in_process(engine, fail_inserts):
+    df = make_frame()
+    fail_inserts['fail_on'] = {4}
+    summary = load_in_batches(df, engine, 'respondents', batch_size=BATCH_SIZE, retries=1)
+
+    assert summary['skipped'] == 3
+    assert summary['loaded'] == 3
+    assert tuple(table_counts(engine)) == (55, 55, df['value'].sum())
+
+
+def test_rerun_of_completed_load_is_noop(engine, fail_inserts):
+    df = make_frame()
+    load_in_batches(df, engine, 'respondents', batch_size=BATCH_SIZE)
+    inserts = fail_inserts['calls']
+
+    summary = load_in_batches(df, engine, 'respondents', batch_size=BATCH_SIZE)
+
+    assert summary['loaded'] == 0
+    assert summary['skipped'] == 6
+    assert fail_inserts['calls'] == inserts
+    assert table_counts(engine)[0] == 55
+
+
+def test_source_path_does_not_change_load(engine):
+    df = make_frame()
+    load_in_batches(df, engine, 'respondents', source_file='etl/cleaned_survey_data.csv',
+                    batch_size=BATCH_SIZE)
+    summary = load_in_batches(df, engine, 'respondents', source_file='cleaned_survey_data.csv',
+                              batch_size=BATCH_SIZE)
+    assert summary['loaded'] == 0
+
+
+def test_new_data_resets_table_and_manifest(engine):
+    old = make_frame(n=55)
+    first = load_in_batches(old, engine, 'respondents', batch_size=BATCH_SIZE)
+
+    new = make_frame(n=23, offset=1000)
+    second = load_in_batches(new, engine, 'respondents', batch_size=BATCH_SIZE)
+
+    assert first['load_key'] != second['load_key']
+    assert manifest_keys(engine) == {second['load_key']}
+    assert tuple(table_counts(engine)) == (23, 23, new['value'].sum())
+
+
+def test_failed_first_batch_keeps_previous_data(engine, fail_inserts):
+    old = make_frame()
+    load_in_batches(old, engine, 'respondents', batch_size=BATCH_SIZE)
+
+    fail_inserts['fail_on'] = {fail_inserts['calls'] + 1}
+    with pytest.raises(OperationalError):
+        load_in_batches(make_frame(offset=1000), engine, 'respondents',
+                        batch_size=BATCH_SIZE, retries=0)
+
+    assert tuple(table_counts(engine)) == (55, 55, old['value'].sum())
+
+
+def test_non_transient_error_is_not_retried(engine, fail_inserts):
+    fail_inserts['fail_on'] = {2, 3, 4}
+    fail_inserts['error'] = IntegrityError
+    with pytest.raises(IntegrityError):
+        load_in_batches(make_frame(), engine, 'respondents', batch_size=BATCH_SIZE, retries=3)
+
+    assert fail_inserts['calls'] == 2
+
+
+def test_empty_load_clears_table(engine):
+    load_in_batches(make_frame(), engine, 'respondents', batch_size=BATCH_SIZE)
+
+    summary = load_in_batches(make_frame().head(0), engine, 'respondents', batch_size=BATCH_SIZE)
+
+    assert summary['batches'] == 0
+    assert table_counts(engine)[0] == 0
+    assert manifest_keys(engine) == set()
+
+
+def test_invalid_mode_rejected(engine):
+    with pytest.raises(ValueError):
+        load_in_batches(make_frame(), engine, 'respondents', mode='upsert')
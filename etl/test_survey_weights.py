@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for post-stratification (raking) survey weights
+"""
+import importlib
+
+import numpy as np
+import pandas as pd
+
+from survey_weights import (POPULATION_MARGINS, WEIGHT_COLUMN, rake_weights,
+                            standardize_education, weight_summary)
+
+MARGINS = {
+    'age_bracket': {'18-34': 0.35, '35-54': 0.40, '55+': 0.25},
+    'gender': {'male': 0.52, 'female': 0.48},
+    'geographic_region': {'South': 0.4, 'West': 0.3, 'North': 0.3}
+}
+
+
+def make_sample(n=5000, seed=0):
+    # Deliberately skewed away from MARGINS
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'age_bracket': rng.choice(['18-34', '35-54', '55+'], n, p=[0.6, 0.3, 0.1]),
+        'gender': rng.choice(['male', 'female'], n, p=[0.3, 0.7]),
+        'geographic_region': rng.choice(['South', 'West', 'North'], n, p=[0.2, 0.2, 0.6])
+    })
+
+
+def weighted_shares(df, weights, var):
+    return weights.groupby(df[var]).sum() / weights.sum()
+
+
+def naive_ipf(df, margins, iterations=200):
+    """Row-level raking, the textbook form of the cell-level fit"""
+    weights = pd.Series(1.0, index=df.index)
+    for _ in range(iterations):
+        for var, margin in margins.items():
+            current = weights.groupby(df[var]).sum() / weights.sum()
+            target = pd.Series(margin) / sum(margin.values())
+            weights = weights * df[var].map(target / current)
+    return weights / weights.mean()
+
+
+def test_raking_reproduces_margins():
+    df = make_sample()
+    weights, diagnostics = rake_weights(df, MARGINS)
+
+    assert diagnostics['converged']
+    assert diagnostics['max_margin_error'] < 1e-6
+    for var, margin in MARGINS.items():
+        shares = weighted_shares(df, weights, var)
+        for category, target in margin.items():
+            assert abs(shares[category] - target) < 1e-6
+    assert np.isclose(weights.mean(), 1.0)
+
+
+def test_raking_matches_row_level_ipf():
+    df = make_sample(n=2000, seed=1)
+    weights, _ = rake_weights(df, MARGINS, tolerance=1e-12, max_iterations=500)
+    np.testing.assert_allclose(weights.to_numpy(), naive_ipf(df, MARGINS).to_numpy(), rtol=1e-6)
+
+
+def test_unmatched_rows_keep_unit_weight():
+    df = make_sample(n=1000)
+    df.loc[:9, 'gender'] = np.nan
+    df.loc[10:14, 'geographic_region'] = 'Overseas'
+    weights, diagnostics = rake_weights(df, MARGINS)
+
+    unmatched = df.index < 15
+    assert diagnostics['unweighted_rows'] == 15
+    assert diagnostics['weighted_rows'] == 985
+    assert (weights[unmatched] == 1.0).all()
+    assert np.isclose(weights[~unmatched].mean(), 1.0)
+    shares = weighted_shares(df[~unmatched], weights[~unmatched], 'gender')
+    assert abs(shares['male'] - 0.52) < 1e-6
+
+
+def test_empty_category_is_dropped_and_renormalized():
+    df = make_sample(n=1000)
+    df = df[df['geographic_region'] != 'North']
+    weights, diagnostics = rake_weights(df, MARGINS)
+
+    assert diagnostics['converged']
+    assert diagnostics['dropped_categories'] == {'geographic_region': ['North']}
+    shares = weighted_shares(df, weights, 'geographic_region')
+    assert abs(shares['South'] - 0.4 / 0.7) < 1e-6
+    assert abs(shares['West'] - 0.3 / 0.7) < 1e-6
+
+
+def test_no_weighting_variables_gives_unit_weights():
+    df = pd.DataFrame({'industry_sector': ['Finance', 'Retail']})
+    weights, diagnostics = rake_weights(df, MARGINS)
+    assert diagnostics['variables'] == []
+    assert (weights == 1.0).all()
+    assert weights.name == WEIGHT_COLUMN
+
+
+def test_many_margins_only_use_observed_cells():
+    # 40^12 category combinations would overflow int64 and cannot be allocated
+    rng = np.random.default_rng(2)
+    margins = {f'var{i}': {f'c{j}': 1 / 40 for j in range(40)} for i in range(12)}
+    df = pd.DataFrame({var: rng.choice(list(margin), 5000) for var, margin in margins.items()})
+    weights, diagnostics = rake_weights(df, margins, max_iterations=20)
+
+    assert diagnostics['weighted_rows'] == 5000
+    assert np.isfinite(weights).all()
+    assert np.isclose(weights.mean(), 1.0)
+
+
+def test_standardize_education():
+    labels = pd.Series(["Bachelor's", ' High School or less', 'Doctorate/Prof', 'Trade School'])
+    assert standardize_education(labels).tolist() == [
+        'Bachelor', 'High School', 'PhD', 'trade school'
+    ]
+
+
+def test_weight_summary():
+    unit = weight_summary(np.ones(100))
+    assert unit['effective_sample_size'] == 100
+    assert unit['design_effect'] == 1
+
+    # Kish: (sum w)^2 / sum w^2 = 36 / 18
+    skewed = weight_summary([1.0, 1.0, 4.0])
+    assert np.isclose(skewed['effective_sample_size'], 2.0)
+    assert np.isclose(skewed['design_effect'], 1.5)
+
+
+def test_quality_report_weighted_shares_match_margins(monkeypatch, tmp_path):
+    monkeypatch.setenv('DATABASE_URL', 'postgresql://localhost/test')
+    clean_and_load = importlib.import_module('clean_and_load')
+    monkeypatch.setattr(clean_and_load, '__file__', str(tmp_path / 'clean_and_load.py'))
+
+    df = pd.DataFrame({
+        'age_bracket': np.repeat(['25-34', '45-54', '65+'], [50, 30, 20]),
+        'gender': np.tile(['male', 'female'], 50),
+        'geographic_region': np.repeat(['South', 'West', 'Midwest', 'Northeast'], 25),
+        'education_level': np.tile(['High School', 'Some College', 'Bachelor', 'Master', 'PhD'], 20)
+    })
+    # Rows without demographics (e.g. industry report metrics) keep weight 1
+    df = pd.concat([df, pd.DataFrame(index=range(10))], ignore_index=True)
+    df[WEIGHT_COLUMN], _ = rake_weights(df, POPULATION_MARGINS)
+
+    report = clean_and_load.generate_data_quality_report(df)
+    region = report['weighted_distributions']['geographic_region']
+    for category, share in region['weighted'].items():
+        assert abs(share - region['population'][category]) < 1e-6